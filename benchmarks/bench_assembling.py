@@ -0,0 +1,58 @@
+"""
+Benchmarks of the reference mappings, term evaluation and assembling.
+"""
+from __future__ import absolute_import
+
+from benchmarks_basic import create_problem
+
+sizes = [11, 21, 31]
+
+def bench_create_mapping(size, output_dir):
+    pb = create_problem(size, kind='elasticity')
+    omega = pb.domain.regions['Omega']
+
+    def run():
+        pb.field.create_mapping(omega, pb.integral, 'volume')
+
+    return run
+
+def bench_eval_laplace(size, output_dir):
+    pb = create_problem(size, kind='laplace')
+
+    def run():
+        pb.term.evaluate(mode='weak', diff_var='u', standalone=False)
+
+    return run
+
+def bench_eval_lin_elastic(size, output_dir):
+    pb = create_problem(size, kind='elasticity')
+
+    def run():
+        pb.term.evaluate(mode='weak', diff_var='u', standalone=False)
+
+    return run
+
+def _make_assemble_bench(size, kind):
+    pb = create_problem(size, kind=kind)
+    mtx = pb.equations.create_matrix_graph()
+    vec = pb.create_state().get_reduced()
+    ev = pb.get_evaluator()
+
+    def run():
+        ev.eval_tangent_matrix(vec, mtx=mtx)
+
+    return run
+
+def bench_assemble_matrix_laplace(size, output_dir):
+    return _make_assemble_bench(size, 'laplace')
+
+def bench_assemble_matrix_lin_elastic(size, output_dir):
+    return _make_assemble_bench(size, 'elasticity')
+
+def bench_create_matrix_graph(size, output_dir):
+    pb = create_problem(size, kind='elasticity')
+
+    def run():
+        pb.equations.create_matrix_graph()
+
+    return run
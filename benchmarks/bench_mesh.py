@@ -0,0 +1,51 @@
+"""
+Benchmarks of the mesh generation, topology and I/O.
+"""
+from __future__ import absolute_import
+import os.path as op
+
+from benchmarks_basic import create_block_mesh
+
+sizes = [21, 41, 61]
+
+def bench_gen_block_mesh(size, output_dir):
+    def run():
+        create_block_mesh(size)
+
+    return run
+
+def bench_setup_connectivity(size, output_dir):
+    from sfepy.discrete.fem.geometry_element import create_geometry_elements
+
+    mesh = create_block_mesh(size)
+    gels = create_geometry_elements()
+
+    def run():
+        cmesh = mesh.cmesh.create_new()
+        cmesh.set_local_entities(gels)
+        cmesh.setup_entities()
+        cmesh.setup_connectivity(cmesh.tdim - 1, cmesh.tdim)
+        cmesh.setup_connectivity(cmesh.tdim, cmesh.tdim)
+
+    return run
+
+def _make_io_bench(size, output_dir, ext):
+    from sfepy.discrete.fem import Mesh
+
+    mesh = create_block_mesh(size)
+    filename = op.join(output_dir, 'block_%d.%s' % (size, ext))
+
+    def run():
+        mesh.write(filename, io='auto')
+        Mesh.from_file(filename)
+
+    return run
+
+def bench_mesh_io_vtk(size, output_dir):
+    return _make_io_bench(size, output_dir, 'vtk')
+
+def bench_mesh_io_mesh(size, output_dir):
+    return _make_io_bench(size, output_dir, 'mesh')
+
+def bench_mesh_io_h5(size, output_dir):
+    return _make_io_bench(size, output_dir, 'h5')
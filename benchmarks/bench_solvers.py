@@ -0,0 +1,62 @@
+"""
+Benchmarks of the linear solvers in :mod:`sfepy.solvers.ls`.
+
+Each repeat creates a new solver instance, so that the timings of the direct
+solvers include both the factorization and the back-substitution, and the
+timings of the iterative solvers include the preconditioner setup.
+"""
+from __future__ import absolute_import
+
+from benchmarks_basic import create_linear_system
+
+sizes = [11, 21, 31]
+
+def _make_solver_bench(size, kind, solver_class, conf):
+    """
+    Return a function that creates the solver and solves the linear system
+    of the given `size` and `kind`. The solver is created in each call to
+    prevent reusing the cached factorization or preconditioner of a previous
+    repeat.
+    """
+    mtx, rhs = create_linear_system(size, kind=kind)
+
+    def run():
+        solver = solver_class(conf)
+        solver(rhs, mtx=mtx)
+
+    return run
+
+def bench_scipy_direct_laplace(size, output_dir):
+    """
+    Factorization and solution.
+    """
+    from sfepy.solvers.ls import ScipyDirect
+
+    return _make_solver_bench(size, 'laplace', ScipyDirect, {})
+
+def bench_scipy_direct_lin_elastic(size, output_dir):
+    """
+    Factorization and solution.
+    """
+    from sfepy.solvers.ls import ScipyDirect
+
+    return _make_solver_bench(size, 'elasticity', ScipyDirect, {})
+
+def bench_scipy_cg_laplace(size, output_dir):
+    """
+    Unpreconditioned CG iterations.
+    """
+    from sfepy.solvers.ls import ScipyIterative
+
+    conf = {'method' : 'cg', 'i_max' : 10000, 'eps_r' : 1e-10}
+    return _make_solver_bench(size, 'laplace', ScipyIterative, conf)
+
+def bench_pyamg_laplace(size, output_dir):
+    """
+    AMG hierarchy setup and CG iterations.
+    """
+    from sfepy.solvers.ls import PyAMGSolver
+
+    conf = {'method' : 'smoothed_aggregation_solver', 'accel' : 'cg',
+            'eps_r' : 1e-10}
+    return _make_solver_bench(size, 'laplace', PyAMGSolver, conf)
@@ -0,0 +1,131 @@
+"""
+This module is not a benchmark file. It contains functions for building
+scalable synthetic problems, that are used in several benchmark files.
+
+All problems are defined on block meshes generated by
+:func:`gen_block_mesh() <sfepy.mesh.mesh_generators.gen_block_mesh>`, with
+`size` vertices along each axis.
+"""
+from __future__ import absolute_import
+
+import numpy as nm
+
+def create_block_mesh(size, dim=3, name='block'):
+    """
+    Create a unit block mesh with `size` vertices along each axis.
+    """
+    from sfepy.mesh.mesh_generators import gen_block_mesh
+
+    mesh = gen_block_mesh(nm.ones(dim), nm.repeat(size, dim),
+                          nm.zeros(dim), name=name, verbose=False)
+    return mesh
+
+def create_block_domain(size, dim=3):
+    """
+    Create a FE domain of the unit block with the 'Omega', 'Left' and
+    'Right' regions.
+    """
+    from sfepy.discrete.fem import FEDomain
+
+    mesh = create_block_mesh(size, dim=dim)
+    domain = FEDomain('domain', mesh)
+
+    domain.create_region('Omega', 'all')
+    domain.create_region('Left', 'vertices in (x < -0.4999)', 'facet')
+    domain.create_region('Right', 'vertices in (x > 0.4999)', 'facet')
+
+    return domain
+
+def create_problem(size, dim=3, kind='laplace', approx_order=1):
+    """
+    Create a stationary linear problem on the unit block.
+
+    Parameters
+    ----------
+    size : int
+        The number of vertices along each axis.
+    dim : 2 or 3
+        The space dimension.
+    kind : 'laplace' or 'elasticity'
+        The kind of the problem, determining the field shape and the term.
+    approx_order : int
+        The field approximation order.
+
+    Returns
+    -------
+    pb : Problem instance
+        The problem with the boundary conditions applied. Its
+        `integral`, `field` and `term` attributes contain the used integral,
+        field and term.
+    """
+    from sfepy.discrete import (FieldVariable, Material, Integral, Equation,
+                                Equations, Problem)
+    from sfepy.discrete.fem import Field
+    from sfepy.discrete.conditions import Conditions, EssentialBC
+    from sfepy.terms import Term
+    from sfepy.mechanics.matcoefs import stiffness_from_lame
+
+    domain = create_block_domain(size, dim=dim)
+    omega = domain.regions['Omega']
+
+    integral = Integral('i', order=2 * approx_order)
+    if kind == 'laplace':
+        field = Field.from_args('fu', nm.float64, 1, omega,
+                                approx_order=approx_order)
+        m = Material('m', c=1.0)
+        expression = 'dw_laplace(m.c, v, u)'
+        left, right = {'u.0' : 0.0}, {'u.0' : 1.0}
+
+    elif kind == 'elasticity':
+        field = Field.from_args('fu', nm.float64, 'vector', omega,
+                                approx_order=approx_order)
+        m = Material('m', D=stiffness_from_lame(dim, lam=1.0, mu=1.0))
+        expression = 'dw_lin_elastic(m.D, v, u)'
+        left, right = {'u.all' : 0.0}, {'u.0' : 0.1}
+
+    else:
+        raise ValueError('unknown problem kind! (%s)' % kind)
+
+    u = FieldVariable('u', 'unknown', field)
+    v = FieldVariable('v', 'test', field, primary_var_name='u')
+
+    term = Term.new(expression, integral, omega, m=m, v=v, u=u)
+    eqs = Equations([Equation('eq', term)])
+
+    pb = Problem('benchmark', equations=eqs)
+    pb.set_bcs(ebcs=Conditions([
+        EssentialBC('left', domain.regions['Left'], left),
+        EssentialBC('right', domain.regions['Right'], right),
+    ]))
+    pb.time_update()
+    pb.update_materials()
+
+    pb.integral = integral
+    pb.field = field
+    pb.term = term
+
+    return pb
+
+def create_linear_system(size, dim=3, kind='laplace', approx_order=1):
+    """
+    Assemble the linear system of the problem created by
+    :func:`create_problem()`.
+
+    Returns
+    -------
+    mtx : csr_matrix
+        The system matrix.
+    rhs : array
+        The right-hand side vector.
+    """
+    pb = create_problem(size, dim=dim, kind=kind, approx_order=approx_order)
+
+    state = pb.create_state()
+    state.apply_ebc()
+
+    ev = pb.get_evaluator()
+    vec = state.get_reduced()
+    rhs = - ev.eval_residual(vec)
+    mtx = ev.eval_tangent_matrix(vec, mtx=pb.equations.create_matrix_graph())
+
+    return mtx, rhs
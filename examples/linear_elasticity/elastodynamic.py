@@ -41,6 +41,14 @@ Solve using the Bathe method::
 
   python simple.py examples/linear_elasticity/elastodynamic.py -O "ts='tsb'"
 
+Solve using the explicit central difference method with the lumped mass::
+
+  python simple.py examples/linear_elasticity/elastodynamic.py -O "ts='tscd'"
+
+The implicit methods ('tsn', 'tsga', 'tsb') can adapt the time step using an
+estimate of the local time discretization error - set the ``'error_rtol'``
+parameter of the solver, for example to 1e-2.
+
 View the resulting deformation using:
 
 - color by :math:`\ul{u}`::
@@ -242,6 +250,18 @@ solvers = {
 
         'verbose' : 1,
     }),
+    'tscd' : ('ts.central_difference', {
+        # Explicit method with the lumped mass -> no linear solver is used in
+        # the time steps, the stability limit of dt is as above.
+        't0' : 0.0,
+        't1' : t1,
+        'dt' : dt,
+        'n_step' : None,
+        'is_linear'  : True,
+        'mass_lumping' : 'row_sum',
+        'constant_loads' : True,
+        'verbose' : 1,
+    }),
     'tsn' : ('ts.newmark', {
         't0' : 0.0,
         't1' : t1,
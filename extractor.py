@@ -15,6 +15,7 @@ $ ./extractor.py -e "p e 0 1999" bone.h5
 $ ./extractor.py -e "p e 0 1999" bone.h5 -a
 $ ./extractor.py -e "p e 0 1999" bone.h5 -o extracted.h5
 $ ./extractor.py -e "p e 0 1999" bone.h5 -o extracted.h5 -a
+$ ./extractor.py --index-history -e "p e 0 1999" bone.h5
 """
 from __future__ import print_function
 from __future__ import absolute_import
@@ -24,6 +25,7 @@ from argparse import ArgumentParser, RawDescriptionHelpFormatter
 import sfepy
 from sfepy.base.base import nm, dict_to_struct, get_default, Struct
 from sfepy.base.ioutils import get_trunk
+from sfepy.discrete.fem.meshio import MeshIO, HDF5MeshIO
 import sfepy.postprocess.time_history as th
 
 def create_problem(filename):
@@ -76,7 +78,10 @@ helps = {
     " Example: 'u n 10 15, p e 0' means variable 'u' in nodes 10, 15"
     " and variable 'p' in element 0",
     'average' :
-    'average vertex variable into cells ("e" extraction mode)'
+    'average vertex variable into cells ("e" extraction mode)',
+    'index_history' :
+    'store the results also in column-oriented datasets for a fast'
+    ' extraction of time histories (HDF5 files only)',
 }
 
 def main():
@@ -113,6 +118,9 @@ def main():
                         default=None, help=helps['extract'])
     parser.add_argument('-a', '--average', action='store_true',
                         dest='average', default=False, help=helps['average'])
+    parser.add_argument('--index-history', action='store_true',
+                        dest='index_history', default=False,
+                        help=helps['index_history'])
     parser.add_argument('input_file', nargs='?', default=None)
     parser.add_argument('results_file')
     options = parser.parse_args()
@@ -129,6 +137,12 @@ def main():
         linearize = True
         options.dump = True
 
+    if options.index_history:
+        io = MeshIO.any_from_filename(filename_results)
+        if not isinstance(io, HDF5MeshIO):
+            parser.error('--index-history requires HDF5 results file! (%s)'
+                         % filename_results)
+
     if options.times:
         steps, times, nts, dts = th.extract_times(filename_results)
         for ii, time in enumerate(times):
@@ -168,6 +182,9 @@ def main():
 
         th.dump_to_vtk(filename_results, output_filename_trunk=trunk, **args)
 
+    if options.index_history:
+        io.write_time_history()
+
     if options.extract:
         ths, ts = th.extract_time_history(filename_results, options.extract)
 